@@ -1,5 +1,6 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import astropy.units as u
 from astropy.io import fits
@@ -19,6 +20,39 @@ __all__ = ["MapEvaluator", "MapDataset"]
 log = logging.getLogger(__name__)
 
 CUTOUT_MARGIN = 0.1 * u.deg
+STAT_SUM_CHUNK_SIZE = 100000
+
+
+def _stat_sum(stat_sum, counts, npred, mask=None, n_jobs=1):
+    """Evaluate a summed fit statistic on flat arrays.
+
+    With ``n_jobs > 1``, the arrays are split into contiguous chunks of
+    ``STAT_SUM_CHUNK_SIZE`` bins that are summed in threads; the Cython stat
+    sums release the GIL. The chunks and the order in which they are added do
+    not depend on ``n_jobs``, so the result does not either.
+
+    Parameters
+    ----------
+    stat_sum : callable
+        Summed fit statistic, e.g. `~gammapy.stats.cash_sum_cython`
+    counts, npred : `~numpy.ndarray`
+        Flat counts and predicted counts arrays
+    mask : `~numpy.ndarray`, optional
+        Flat boolean mask
+    n_jobs : int
+        Number of threads.
+    """
+    args = (counts, npred) if mask is None else (counts, npred, mask)
+
+    if n_jobs < 2 or counts.size <= STAT_SUM_CHUNK_SIZE:
+        return stat_sum(*args)
+
+    chunks = [
+        [arg[lo : lo + STAT_SUM_CHUNK_SIZE] for arg in args]
+        for lo in range(0, counts.size, STAT_SUM_CHUNK_SIZE)
+    ]
+    with ThreadPoolExecutor(n_jobs) as executor:
+        return sum(executor.map(lambda chunk: stat_sum(*chunk), chunks))
 
 
 class MapDataset(Dataset):
@@ -53,6 +87,9 @@ class MapDataset(Dataset):
         Mask defining the safe data range.
     gti : '~gammapy.data.gti.GTI'
         GTI of the observation or union of GTI if it is a stacked observation
+    n_jobs : int
+        Number of threads used to sum the likelihood over large maps.
+        The default of one evaluates it in the calling thread.
 
     """
 
@@ -69,6 +106,7 @@ class MapDataset(Dataset):
         evaluation_mode="local",
         mask_safe=None,
         gti=None,
+        n_jobs=1,
     ):
         if mask_fit is not None and mask_fit.dtype != np.dtype("bool"):
             raise ValueError("mask data must have dtype bool")
@@ -84,6 +122,7 @@ class MapDataset(Dataset):
         self.background_model = background_model
         self.mask_safe = mask_safe
         self.gti = gti
+        self.n_jobs = n_jobs
         if likelihood == "cash":
             self._stat = cash
             self._stat_sum = cash_sum_cython
@@ -401,12 +440,10 @@ class MapDataset(Dataset):
         """
         counts, npred = self._counts_data, self.npred().data
 
-        if self.mask is not None:
-            stat = self._stat_sum(counts[self.mask], npred[self.mask])
-        else:
-            stat = self._stat_sum(counts.ravel(), npred.ravel())
-
-        return stat
+        mask = self.mask.ravel() if self.mask is not None else None
+        return _stat_sum(
+            self._stat_sum, counts.ravel(), npred.ravel(), mask, n_jobs=self.n_jobs
+        )
 
     def fake(self, random_state="random-seed"):
         """
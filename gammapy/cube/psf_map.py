@@ -1,16 +1,133 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+import copy
+import logging
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+import scipy.integrate
 import astropy.io.fits as fits
 import astropy.units as u
 from astropy.coordinates import Angle
+from astropy.coordinates.angle_utilities import angular_separation
 from gammapy.cube import PSFKernel
 from gammapy.irf import EnergyDependentTablePSF
 from gammapy.maps import Map
 
 __all__ = ["make_psf_map", "PSFMap"]
 
+log = logging.getLogger(__name__)
 
-def make_psf_map(psf, pointing, geom, max_offset, exposure_map=None):
+# Per-geom cache of the image geometry, its sky coordinates and the
+# separations to recently used pointing positions. Entries are keyed by
+# ``id(geom)`` and evicted when the geom is garbage collected, so that the id
+# cannot be reused by another object while the entry exists.
+_GEOM_CACHE = OrderedDict()
+_GEOM_CACHE_SIZE = 4
+_SEPARATION_CACHE_SIZE = 4
+
+
+def _get_geom_cache(geom):
+    key = id(geom)
+    entry = _GEOM_CACHE.get(key)
+
+    if entry is None:
+        entry = {
+            "finalizer": weakref.finalize(geom, _GEOM_CACHE.pop, key, None),
+            "image": geom.to_image(),
+            "separations": OrderedDict(),
+        }
+        _GEOM_CACHE[key] = entry
+
+    _GEOM_CACHE.move_to_end(key)
+    while len(_GEOM_CACHE) > _GEOM_CACHE_SIZE:
+        _, evicted = _GEOM_CACHE.popitem(last=False)
+        evicted["finalizer"].detach()
+
+    return entry
+
+
+def _image_geom(geom):
+    """Image geometry of a geom (cached)."""
+    return _get_geom_cache(geom)["image"]
+
+
+def _fast_separation(pointing, skycoord):
+    """Angular separation between the pointing and an array of sky coordinates.
+
+    If both are given in the same frame, the separation is computed directly
+    on the spherical coordinates, skipping the frame transformation machinery
+    of `~astropy.coordinates.SkyCoord.separation`.
+    """
+    if not pointing.is_equivalent_frame(skycoord):
+        return pointing.separation(skycoord)
+
+    # Work on bare float arrays in radians, to avoid the Quantity overhead
+    p = pointing.represent_as("unitspherical")
+    c = skycoord.represent_as("unitspherical")
+    separation = angular_separation(p.lon.rad, p.lat.rad, c.lon.rad, c.lat.rad)
+    return Angle(separation, "rad")
+
+
+def _pointing_separation(pointing, geom):
+    """Separation of the image pixel centers of a geom to the pointing (cached)."""
+    entry = _get_geom_cache(geom)
+    separations = entry["separations"]
+
+    icrs = pointing.icrs
+    key = (float(icrs.ra.deg), float(icrs.dec.deg))
+
+    if key not in separations:
+        if "skycoord" not in entry:
+            entry["skycoord"] = entry["image"].get_coord().skycoord
+        separations[key] = _fast_separation(pointing, entry["skycoord"])
+
+    separations.move_to_end(key)
+    while len(separations) > _SEPARATION_CACHE_SIZE:
+        separations.popitem(last=False)
+
+    return separations[key]
+
+
+def _linear_weights(pix, nbin):
+    """Indices and weights of the two pixels for linear interpolation.
+
+    Outside of the axis range the values are extrapolated linearly from the
+    two edge pixels, as done by `~gammapy.maps.Map.interp_by_pix`. A pixel
+    coordinate of NaN (position not covered by the map projection) gives NaN
+    weights.
+    """
+    pix = float(np.squeeze(pix))
+    if not np.isfinite(pix):
+        return np.array([0, min(1, nbin - 1)]), np.array([np.nan, np.nan])
+
+    idx = int(np.clip(np.floor(pix), 0, max(nbin - 2, 0)))
+    idx = np.array([idx, min(idx + 1, nbin - 1)])
+    weight = pix - idx[0]
+    return idx, np.array([1 - weight, weight])
+
+
+def _evaluate_psf(psf, offset, energy, rad, n_jobs=1):
+    """Evaluate the PSF, split in chunks of energy over ``n_jobs`` threads."""
+    n_chunks = min(n_jobs, len(energy))
+
+    if n_chunks <= 1:
+        return psf.evaluate(offset=offset, energy=energy, rad=rad)
+
+    def evaluate(energy_chunk):
+        return psf.evaluate(offset=offset, energy=energy_chunk, rad=rad)
+
+    with ThreadPoolExecutor(max_workers=n_chunks) as executor:
+        results = list(executor.map(evaluate, np.array_split(energy, n_chunks)))
+
+    unit = results[0].unit
+    values = np.concatenate([_.to_value(unit) for _ in results], axis=2)
+    return u.Quantity(values, unit, copy=False)
+
+
+def make_psf_map(
+    psf, pointing, geom, max_offset, exposure_map=None, n_jobs=1, dtype="float32"
+):
     """Make a psf map for a single observation
 
     Expected axes : rad and true energy in this specific order
@@ -30,6 +147,13 @@ def make_psf_map(psf, pointing, geom, max_offset, exposure_map=None):
     exposure_map : `~gammapy.maps.Map`, optional
         the associated exposure map.
         default is None
+    n_jobs : int
+        Number of threads used to evaluate the PSF. The energy bins are
+        split in chunks evaluated in parallel. Default is 1.
+    dtype : str
+        Data type of the PSF map. The default single precision is sufficient
+        for the PSF values and halves the memory of the map; use "float64"
+        if the map is further processed with high precision requirements.
 
     Returns
     -------
@@ -38,23 +162,28 @@ def make_psf_map(psf, pointing, geom, max_offset, exposure_map=None):
     """
     energy = geom.get_axis_by_name("energy").center
 
-    rad_axis = geom.get_axis_by_name("theta")
-    rad = Angle(rad_axis.center, unit=rad_axis.unit)
+    rad = geom.get_axis_by_name("theta").center
 
     # Compute separations with pointing position
-    separations = pointing.separation(geom.to_image().get_coord().skycoord)
-    valid = np.where(separations < max_offset)
+    separations = _pointing_separation(pointing, geom)
+    valid = separations < max_offset
 
     # Compute PSF values
-    psf_values = psf.evaluate(offset=separations[valid], energy=energy, rad=rad)
-
-    # Re-order axes to be consistent with expected geometry
-    psf_values = np.transpose(psf_values, axes=(2, 0, 1))
+    psf_values = _evaluate_psf(psf, separations[valid], energy, rad, n_jobs)
 
     # TODO: this probably does not ensure that probability is properly normalized in the PSFMap
-    # Create Map and fill relevant entries
-    psfmap = Map.from_geom(geom, unit="sr-1")
-    psfmap.data[:, :, valid[0], valid[1]] += psf_values.to_value(psfmap.unit)
+    # Create Map and fill relevant entries. The map is empty, so the values
+    # can be assigned directly instead of being accumulated
+    psfmap = Map.from_geom(geom, unit="sr-1", dtype=dtype)
+
+    # Convert to the map unit in place, with a single scalar factor
+    factor = psf_values.unit.to(psfmap.unit)
+    psf_values = psf_values.value
+    if factor != 1:
+        psf_values *= factor
+
+    # Re-order axes to be consistent with expected geometry
+    psfmap.data[..., valid] = np.transpose(psf_values, axes=(2, 0, 1))
 
     return PSFMap(psfmap, exposure_map)
 
@@ -114,23 +243,55 @@ class PSFMap:
         psf_map.write('psf_map.fits')
     """
 
-    def __init__(self, psf_map, exposure_map=None):
-        if psf_map.geom.axes[1].name.upper() != "ENERGY":
-            raise ValueError("Incorrect energy axis position in input Map")
-
-        if psf_map.geom.axes[0].name.upper() != "THETA":
-            raise ValueError("Incorrect theta axis position in input Map")
+    __slots__ = [
+        "_psf_map",
+        "exposure_map",
+        "_energy",
+        "_rad",
+        "_table_psf",
+    ]
 
+    def __init__(self, psf_map, exposure_map=None):
         self.psf_map = psf_map
 
         if exposure_map is not None:
             # First adapt geometry, keep only energy axis
-            expected_geom = psf_map.geom.to_image().to_cube([psf_map.geom.axes[1]])
+            expected_geom = _image_geom(psf_map.geom).to_cube([psf_map.geom.axes[1]])
             if exposure_map.geom != expected_geom:
                 raise ValueError("PSFMap and exposure_map have inconsistent geometries")
 
         self.exposure_map = exposure_map
 
+    @property
+    def psf_map(self):
+        """PSF map (`~gammapy.maps.Map`).
+
+        The energy and rad axes are cached, and reset when a new map is
+        assigned.
+        """
+        return self._psf_map
+
+    @psf_map.setter
+    def psf_map(self, psf_map):
+        if psf_map.geom.axes[1].name.upper() != "ENERGY":
+            raise ValueError("Incorrect energy axis position in input Map")
+
+        if psf_map.geom.axes[0].name.upper() != "THETA":
+            raise ValueError("Incorrect theta axis position in input Map")
+
+        self._psf_map = psf_map
+
+        # Static axes, they only depend on the map geometry
+        self._energy = psf_map.geom.axes[1].center
+        self._rad = psf_map.geom.axes[0].center
+
+        # Template for the table PSFs, which all share the same axes
+        self._table_psf = EnergyDependentTablePSF(
+            energy=self._energy,
+            rad=self._rad,
+            psf_value=u.Quantity(np.zeros(psf_map.data.shape[:2]), "sr-1"),
+        )
+
     @classmethod
     def from_hdulist(
         cls,
@@ -224,26 +385,29 @@ class PSFMap:
                 "EnergyDependentTablePSF can be extracted at one single position only."
             )
 
-        # axes ordering fixed. Could be changed.
-        pix_ener = np.arange(self.psf_map.geom.axes[1].nbin)
-        pix_rad = np.arange(self.psf_map.geom.axes[0].nbin)
-
         # Convert position to pixels
-        pix_lon, pix_lat = self.psf_map.geom.to_image().coord_to_pix(position)
-
-        # Build the pixels tuple
-        pix = np.meshgrid(pix_lon, pix_lat, pix_rad, pix_ener)
-
-        # Interpolate in the PSF map. Squeeze to remove dimensions of length 1
-        psf_values = np.squeeze(
-            self.psf_map.interp_by_pix(pix) * u.Unit(self.psf_map.unit)
-        )
-
-        energies = self.psf_map.geom.axes[1].center
-        rad = self.psf_map.geom.axes[0].center
-
-        # Beware. Need to revert rad and energies to follow the TablePSF scheme.
-        return EnergyDependentTablePSF(energy=energies, rad=rad, psf_value=psf_values.T)
+        pix_lon, pix_lat = _image_geom(self.psf_map.geom).coord_to_pix(position)
+
+        # The energy and rad axes are taken at their exact nodes, so only the
+        # spatial weights depend on the position. Interpolate bilinearly in
+        # the image plane, from the 2 x 2 neighbouring pixels of all the
+        # (energy, rad) slabs at once
+        ny, nx = self.psf_map.data.shape[-2:]
+        idx_lon, weights_lon = _linear_weights(pix_lon, nx)
+        idx_lat, weights_lat = _linear_weights(pix_lat, ny)
+
+        # The weighted sum over the spatial axes is a single matrix-vector
+        # product with the (energy * rad, 4) reshaped data
+        data = self.psf_map.data[..., idx_lat[:, np.newaxis], idx_lon]
+        weights = np.outer(weights_lat, weights_lon)
+        psf_values = np.tensordot(data, weights, axes=2)
+        psf_values = u.Quantity(psf_values, self.psf_map.unit, copy=False)
+
+        # Shallow copy of the template, to avoid converting the axes again.
+        # Only the PSF values differ between the returned tables.
+        table_psf = copy.copy(self._table_psf)
+        table_psf.psf_value = psf_values.to("sr-1")
+        return table_psf
 
     def get_psf_kernel(self, position, geom, max_radius=None, factor=4):
         """Returns a PSF kernel at the given position.
@@ -284,16 +448,72 @@ class PSFMap:
         containment_radius_map : `~gammapy.maps.Map`
             Containment radius map
         """
-        coords = self.psf_map.geom.to_image().get_coord().skycoord.flatten()
-        m = Map.from_geom(self.psf_map.geom.to_image(), unit="deg")
+        m = Map.from_geom(_image_geom(self.psf_map.geom), unit="deg")
+
+        energies = self._energy.to_value("GeV")
+        energy = u.Quantity(energy).to_value("GeV")
+
+        # The containment is 1 outside the energy range, as for the table PSF
+        if not energies[0] <= energy <= energies[-1]:
+            return m
+
+        idx = np.clip(np.searchsorted(energies, energy) - 1, 0, len(energies) - 2)
+        weight = (energy - energies[idx]) / (energies[idx + 1] - energies[idx])
+        rad, containment_lo = self._get_containment(idx)
+        _, containment_hi = self._get_containment(idx + 1)
+        containment = (1 - weight) * containment_lo + weight * containment_hi
+
+        valid = containment[-1] > 0
+        if not np.allclose(containment[-1][valid], 1, atol=0.01):
+            log.warning(
+                "PSF does not integrate to unity within a precision of 1% in each energy bin."
+                " Containment radius computation might give biased results."
+            )
 
-        for coord in coords:
-            psf_table = self.get_energy_dependent_table_psf(coord)
-            containment_radius = psf_table.containment_radius(energy, fraction)
-            m.fill_by_coord(coord, containment_radius)
+        # Find the nearest containment value on an upsampled rad grid, one
+        # image row at a time to limit memory usage
+        rad_max = np.linspace(0, rad[-1], 10 * len(self._rad))
+        idx = np.clip(np.searchsorted(rad, rad_max) - 1, 0, len(rad) - 2)
+        weight = ((rad_max - rad[idx]) / (rad[idx + 1] - rad[idx]))[:, np.newaxis]
+
+        for row in range(containment.shape[1]):
+            values = containment[:, row]
+            values = (1 - weight) * values[idx] + weight * values[idx + 1]
+            fraction_idx = np.argmin(np.abs(values - fraction), axis=0)
+            m.data[row] = np.rad2deg(rad_max[fraction_idx])
 
         return m
 
+    def _get_containment(self, idx):
+        """Cumulative containment along the rad axis for one energy bin.
+
+        Parameters
+        ----------
+        idx : int
+            Energy bin index.
+
+        Returns
+        -------
+        rad : `~numpy.ndarray`
+            Rad values in radian, starting at zero.
+        containment : `~numpy.ndarray`
+            Containment fraction, with shape (rad, lat, lon).
+        """
+        rad = self._rad.to_value("rad")
+        psf = self.psf_map.data[idx].astype(np.float64)
+        psf *= self.psf_map.unit.to("sr-1")
+
+        # Extrapolate the PSF linearly to zero, as done by the table PSF
+        if rad[0] > 0:
+            weight = -rad[0] / (rad[1] - rad[0])
+            psf_0 = np.clip((1 - weight) * psf[0] + weight * psf[1], 0, None)
+            psf = np.concatenate([psf_0[np.newaxis], psf])
+            rad = np.insert(rad, 0, 0)
+
+        psf *= 2 * np.pi * rad[:, np.newaxis, np.newaxis]
+        containment = scipy.integrate.cumtrapz(psf, rad, initial=0, axis=0)
+        return rad, containment
+
     def stack(self, other):
         """Stack PSFMap with another one.
 
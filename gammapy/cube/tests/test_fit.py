@@ -1,4 +1,5 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+import threading
 import pytest
 import numpy as np
 from numpy.testing import assert_allclose
@@ -6,6 +7,7 @@ import astropy.units as u
 from astropy.coordinates import SkyCoord
 from regions import CircleSkyRegion
 from gammapy.cube import MapDataset, PSFKernel, make_map_exposure_true_energy
+from gammapy.cube.fit import _stat_sum
 from gammapy.cube.models import BackgroundModel, SkyModel
 from gammapy.image.models import SkyGaussian
 from gammapy.irf import (
@@ -15,6 +17,7 @@ from gammapy.irf import (
 )
 from gammapy.maps import Map, MapAxis, WcsGeom
 from gammapy.spectrum.models import PowerLaw
+from gammapy.stats import cash_sum_cython
 from gammapy.utils.fitting import Fit
 from gammapy.utils.testing import mpl_plot_check, requires_data, requires_dependency
 
@@ -309,3 +312,25 @@ def test_map_fit_one_energy_bin(sky_model, geom_image):
 
     assert_allclose(pars["amplitude"].value, 1e-11, rtol=1e-2)
     assert_allclose(pars.error("amplitude"), 2.163318e-12, rtol=1e-2)
+
+
+def test_stat_sum_threads():
+    random_state = np.random.RandomState(0)
+    counts = random_state.poisson(2, 300001).astype(float)
+    npred = random_state.uniform(0, 5, 300001)
+    mask = random_state.uniform(size=300001) > 0.3
+
+    desired = cash_sum_cython(counts, npred, mask)
+    assert _stat_sum(cash_sum_cython, counts, npred, mask) == desired
+
+    actual = _stat_sum(cash_sum_cython, counts, npred, mask, n_jobs=3)
+    assert_allclose(actual, desired, rtol=1e-10)
+
+    # the result does not depend on the number of threads
+    for n_jobs in [2, 4]:
+        assert _stat_sum(cash_sum_cython, counts, npred, mask, n_jobs=n_jobs) == actual
+
+    # the worker threads are shut down after each call
+    n_threads = threading.active_count()
+    _stat_sum(cash_sum_cython, counts, npred, mask, n_jobs=5)
+    assert threading.active_count() == n_threads
@@ -1,12 +1,15 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+import gc
+import pytest
 import numpy as np
 from numpy.testing import assert_allclose
 import astropy.units as u
 from astropy.coordinates import SkyCoord
 from astropy.units import Unit
 from gammapy.cube import PSFMap, make_map_exposure_true_energy, make_psf_map
+from gammapy.cube.psf_map import _GEOM_CACHE, _image_geom
 from gammapy.irf import PSF3D, EffectiveAreaTable2D
-from gammapy.maps import MapAxis, WcsGeom
+from gammapy.maps import Map, MapAxis, WcsGeom
 
 
 def fake_psf3d(sigma=0.15 * u.deg, shape="gauss"):
@@ -67,6 +70,38 @@ def test_make_psf_map():
     assert psfmap.psf_map.unit == Unit("sr-1")
     assert psfmap.psf_map.data.shape == (4, 50, 25, 25)
 
+    # repeated calls on the same geom re-use the cached separations
+    psfmap_2 = make_psf_map(psf, pointing, geom, 3 * u.deg)
+    assert_allclose(psfmap_2.psf_map.data, psfmap.psf_map.data)
+
+    psfmap_3 = make_psf_map(psf, pointing, geom, 3 * u.deg, n_jobs=2)
+    assert_allclose(psfmap_3.psf_map.data, psfmap.psf_map.data)
+
+    psfmap_4 = make_psf_map(psf, pointing, geom, 3 * u.deg, dtype="float64")
+    assert psfmap_4.psf_map.data.dtype == np.float64
+    assert_allclose(psfmap_4.psf_map.data, psfmap.psf_map.data, rtol=1e-6)
+
+
+def test_geom_cache_release():
+    geom = WcsGeom.create(binsz=0.5, width=2, axes=[MapAxis.from_nodes([1, 2])])
+    key = id(geom)
+    assert _image_geom(geom) is _image_geom(geom)
+    assert key in _GEOM_CACHE
+
+    del geom
+    gc.collect()
+    assert key not in _GEOM_CACHE
+
+
+def test_psfmap_axes_check():
+    energy_axis = MapAxis(nodes=[0.2, 0.7, 1.5, 2.0, 10.0], unit="TeV", name="energy")
+    rad_axis = MapAxis(nodes=np.linspace(0.0, 1.0, 51), unit="deg", name="theta")
+
+    geom = WcsGeom.create(binsz=0.2, width=5, axes=[energy_axis, rad_axis])
+
+    with pytest.raises(ValueError):
+        PSFMap(Map.from_geom(geom, unit="sr-1"))
+
 
 def make_test_psfmap(size, shape="gauss"):
     psf = fake_psf3d(size, shape)
@@ -109,6 +144,49 @@ def test_psfmap_to_table_psf():
         rtol=1e-2,
     )
 
+    # Tables extracted at other positions are independent objects
+    table_psf_2 = psfmap.get_energy_dependent_table_psf(SkyCoord(2, 0, unit="deg"))
+    assert table_psf_2 is not table_psf
+    assert table_psf_2.psf_value is not table_psf.psf_value
+    assert_allclose(
+        table_psf.evaluate(1 * u.TeV, 0 * u.deg).value, 23255.412, rtol=1e-5
+    )
+
+
+def test_psfmap_to_table_psf_edge():
+    energy_axis = MapAxis.from_nodes([1, 10], unit="TeV", name="energy")
+    rad_axis = MapAxis.from_nodes([0, 0.1, 0.2], unit="deg", name="theta")
+    geom = WcsGeom.create(binsz=1, width=(5, 3), axes=[rad_axis, energy_axis])
+
+    # PSF values increase linearly with the longitude pixel index
+    psf_map = Map.from_geom(geom, unit="sr-1")
+    psf_map.data += 10 + np.arange(5)
+    psfmap = PSFMap(psf_map)
+
+    # Half a pixel inside and a quarter pixel beyond the map edges, values
+    # are interpolated and extrapolated linearly
+    image_geom = geom.to_image()
+    lon, lat = image_geom.pix_to_coord(([-0.25, 0.5, 3.5, 4.25], [1, 1, 1, 1]))
+    positions = SkyCoord(lon, lat, unit="deg")
+    for position, expected in zip(positions, [9.75, 10.5, 13.5, 14.25]):
+        table_psf = psfmap.get_energy_dependent_table_psf(position)
+        assert_allclose(table_psf.psf_value.value, expected)
+
+
+def test_psfmap_to_table_psf_outside_projection():
+    energy_axis = MapAxis.from_nodes([1, 10], unit="TeV", name="energy")
+    rad_axis = MapAxis.from_nodes([0, 0.1, 0.2], unit="deg", name="theta")
+    geom = WcsGeom.create(
+        binsz=1, width=(5, 3), proj="TAN", axes=[rad_axis, energy_axis]
+    )
+    psfmap = PSFMap(Map.from_geom(geom, unit="sr-1"))
+
+    # The opposite hemisphere has no pixel coordinates in a TAN projection
+    position = SkyCoord(180, 0, unit="deg")
+    table_psf = psfmap.get_energy_dependent_table_psf(position)
+    assert table_psf.psf_value.shape == (2, 3)
+    assert np.all(np.isnan(table_psf.psf_value))
+
 
 def test_psfmap_to_psf_kernel():
     psfmap = make_test_psfmap(0.15 * u.deg)
@@ -163,6 +241,25 @@ def test_containment_radius_map():
     assert_allclose(val, 0.226477, rtol=1e-3)
 
 
+def test_psfmap_set_psf_map():
+    psfmap = make_test_psfmap(0.15 * u.deg)
+    position = SkyCoord(0, 0, unit="deg")
+    radius = psfmap.containment_radius_map(1 * u.TeV).data
+    value = psfmap.get_energy_dependent_table_psf(position).psf_value
+
+    # Assigning a new map resets the cached containment
+    psfmap.psf_map = make_test_psfmap(0.3 * u.deg).psf_map
+    new_radius = psfmap.containment_radius_map(1 * u.TeV).data
+    new_value = psfmap.get_energy_dependent_table_psf(position).psf_value
+    assert_allclose(new_radius[12, 12], 2 * radius[12, 12], rtol=0.1)
+    assert_allclose(new_value[:, 0], value[:, 0] / 4, rtol=0.1)
+
+    # In place changes of the data are taken into account
+    psfmap.psf_map.data[...] = make_test_psfmap(0.15 * u.deg).psf_map.data
+    assert_allclose(psfmap.containment_radius_map(1 * u.TeV).data, radius)
+    assert_allclose(psfmap.get_energy_dependent_table_psf(position).psf_value, value)
+
+
 def test_psfmap_stacking():
     psfmap1 = make_test_psfmap(0.1 * u.deg, shape="flat")
     psfmap2 = make_test_psfmap(0.1 * u.deg, shape="flat")
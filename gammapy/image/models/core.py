@@ -1,11 +1,11 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+import functools
 import logging
 import numpy as np
 import scipy.integrate
 import scipy.special
 import astropy.units as u
-from astropy.coordinates import Angle, Latitude, Longitude, SkyCoord
-from astropy.coordinates.angle_utilities import angular_separation, position_angle
+from astropy.coordinates import Angle, Latitude, SkyCoord
 from gammapy.maps import Map
 from gammapy.utils.fitting import Model, Parameter
 
@@ -26,14 +26,224 @@ log = logging.getLogger(__name__)
 
 EDGE_WIDTH_95 = 2.326174307353347
 
+# unit instances for the evaluate methods, parsing unit strings on every call
+# dominates the evaluation time for small arrays
+_SR_1 = u.Unit("sr-1")
+_DEG_2 = u.Unit("deg-2")
+
 
 def smooth_edge(x, width):
-    value = (x / width).to_value("")
-    return 0.5 * (1 - scipy.special.erf(value * EDGE_WIDTH_95))
+    value = (
+        u.Quantity(x / width, copy=False).to_value(u.dimensionless_unscaled)
+        * EDGE_WIDTH_95
+    )
+
+    # erf(value) is exactly +-1 in double precision for abs(value) >= 6, so
+    # it only needs to be evaluated in the band around the edge
+    result = np.zeros_like(value)
+    result[value < 0] = 1
+    band = np.abs(value) < 6
+    result[band] = 0.5 * (1 - scipy.special.erf(value[band]))
+    return result
+
+
+def _wrap_lon(lon):
+    """Wrap longitude to the range [-180, 180) deg.
+
+    Same as ``Longitude(lon).wrap_at("180d")``, but on the float value. The
+    unit of the input is kept, and values in the range are returned unchanged.
+    """
+    if isinstance(lon, str):
+        lon = Angle(lon)
+
+    unit = getattr(lon, "unit", None)
+    if unit is None or not unit.is_equivalent(u.rad):
+        raise u.UnitTypeError(
+            "Longitude requires units equivalent to 'rad', got {!r}".format(lon)
+        )
+
+    value = lon.to_value(u.deg)
+    # only shift values outside of the range, the modulo is not exact
+    outside = (value < -180) | (value >= 180)
+    wrapped = u.Quantity((value + 180) % 360 - 180, u.deg).to_value(unit)
+    return u.Quantity(np.where(outside, wrapped, lon.value), unit)
+
+
+def _to_deg(angle):
+    """Convert angle to a bare float array in degrees.
+
+    Floats are interpreted as degrees.
+    """
+    if isinstance(angle, u.Quantity):
+        return angle.to_value(u.deg)
+    return u.Quantity(angle, u.deg, copy=False).value
+
+
+def _to_rad(angle):
+    """Convert angle to a bare float array in radians.
+
+    Floats are interpreted as radians, as in
+    `~astropy.coordinates.angle_utilities.angular_separation`.
+    """
+    if isinstance(angle, u.Quantity):
+        return angle.to_value(u.rad)
+    return u.Quantity(angle, u.rad, copy=False).value
+
+
+def _coords_rad(lon, lat):
+    """Coordinates as bare float radian arrays, with ``cos(lat)``."""
+    lon, lat = _to_rad(lon), _to_rad(lat)
+    return {"lon": lon, "lat": lat, "cos_lat": np.cos(lat)}
+
+
+def _haversine_term(coords, lon_0, lat_0):
+    """Haversine of the angular separation, on bare float arrays in radians.
+
+    This is ``sin(sep / 2) ** 2 = (1 - cos(sep)) / 2``. The result is a
+    new array, computed in place with one temporary, so callers can continue
+    to work in place on it.
+    """
+    lon, lat, cos_lat = np.broadcast_arrays(
+        coords["lon"], coords["lat"], coords["cos_lat"]
+    )
+    dtype = np.result_type(lon.dtype, lat.dtype)
+
+    value = np.subtract(lat, lat_0, out=np.empty(lat.shape, dtype))
+    value *= 0.5
+    np.sin(value, out=value)
+    np.square(value, out=value)
+
+    term = np.subtract(lon, lon_0, out=np.empty(lon.shape, dtype))
+    term *= 0.5
+    np.sin(term, out=term)
+    np.square(term, out=term)
+    term *= cos_lat
+    term *= np.cos(lat_0)
+
+    value += term
+    return value
+
+
+def _haversine(coords, lon_0, lat_0):
+    """Angular separation on bare float arrays in radians.
+
+    Uses the haversine formula, which is cheaper than the Vincenty formula
+    used by `~astropy.coordinates.angle_utilities.angular_separation` and
+    accurate for small separations.
+    """
+    value = _haversine_term(coords, lon_0, lat_0)
+    np.minimum(value, 1, out=value)
+    np.sqrt(value, out=value)
+    np.arcsin(value, out=value)
+    value *= 2
+    return value
+
+
+def _position_angle_rad(lon_0, lat_0, coords):
+    """Position angle (East of North) of the coordinates seen from ``lon_0, lat_0``."""
+    if "sin_lat" not in coords:
+        coords["sin_lat"] = np.sin(coords["lat"])
+
+    deltalon = coords["lon"] - lon_0
+    colat = coords["cos_lat"]
+    x = coords["sin_lat"] * np.cos(lat_0) - colat * np.sin(lat_0) * np.cos(deltalon)
+    y = np.sin(deltalon) * colat
+    return np.arctan2(y, x)
+
+
+def _ellipse_foci_rad(lon_0, lat_0, phi, c):
+    """Foci of an ellipse, at distance ``c`` from the center along ``phi``.
+
+    Same as `~astropy.coordinates.angle_utilities.offset_by` with position
+    angles ``phi`` and ``phi + 180 deg``, on scalar floats in radians.
+    """
+    cos_a, sin_a = np.cos(c), np.sin(c)
+    cos_c, sin_c = np.sin(lat_0), np.cos(lat_0)
+    cos_B, sin_B = np.cos(phi), np.sin(phi)
+
+    foci = []
+    # the second focus has position angle phi + 180 deg, i.e. opposite cos_B, sin_B
+    for sign in [1, -1]:
+        cos_b = cos_c * cos_a + sign * sin_c * sin_a * cos_B
+        xsin_A = sign * sin_a * sin_B * sin_c
+        xcos_A = cos_a - cos_b * cos_c
+        if sin_c < 1e-12:
+            # pole, treated as infinitesimally close to it at the given lon
+            posang = phi if sign == 1 else phi + np.pi
+            A = 0.5 * np.pi + cos_c * (0.5 * np.pi - posang)
+        else:
+            A = np.arctan2(xsin_A, xcos_A)
+        foci.append((lon_0 + A, np.arcsin(cos_b)))
+    return foci
+
+
+def _focal_distance_sum(coords, foci):
+    """Sum of the angular separations to the foci, in radians.
+
+    Uses the Vincenty formula, with the trigonometric
+    functions of the coordinates shared by both foci.
+    """
+    for key, func, name in [
+        ("sin_lat", np.sin, "lat"),
+        ("sin_lon", np.sin, "lon"),
+        ("cos_lon", np.cos, "lon"),
+    ]:
+        if key not in coords:
+            coords[key] = func(coords[name])
+
+    sin_lon, cos_lon = coords["sin_lon"], coords["cos_lon"]
+    sin_lat, cos_lat = coords["sin_lat"], coords["cos_lat"]
+
+    result = 0
+    for lon_f, lat_f in foci:
+        sin_lat_f, cos_lat_f = np.sin(lat_f), np.cos(lat_f)
+        # sin and cos of (lon_f - lon)
+        sdlon = np.sin(lon_f) * cos_lon - np.cos(lon_f) * sin_lon
+        cdlon = np.cos(lon_f) * cos_lon + np.sin(lon_f) * sin_lon
+
+        num1 = cos_lat_f * sdlon
+        num2 = cos_lat * sin_lat_f - sin_lat * cos_lat_f * cdlon
+        denominator = sin_lat * sin_lat_f + cos_lat * cos_lat_f * cdlon
+        result = result + np.arctan2(np.hypot(num1, num2), denominator)
+    return result
+
+
+@functools.lru_cache(maxsize=256)
+def _ellipse_norm(semi_major, e):
+    """Normalization factor of `SkyEllipse`, with ``semi_major`` in radians."""
+    semi_minor = semi_major * np.sqrt(1 - e ** 2)
+
+    B = 1 / np.sin(semi_minor) ** 2
+    C = 1 / np.sin(semi_major) ** 2 - B
+
+    def integral_fcn(x):
+        cs2 = np.cos(x) ** 2
+        return 1 - np.sqrt(1 - 1 / (B + C * cs2))
+
+    return (2 * scipy.integrate.quad(integral_fcn, 0, np.pi)[0]) ** -1
+
+
+def _linear_kernel(diff, grad):
+    """Evaluate ``max(1 - abs(diff) / grad, 0) / grad``.
+
+    Computed in place, ``diff`` and ``grad`` are overwritten.
+    """
+    inv_grad = np.divide(1, grad, out=grad)
+    value = np.abs(diff, out=diff)
+    value *= inv_grad
+    np.subtract(1, value, out=value)
+    np.maximum(value, 0, out=value)
+    value *= inv_grad
+    return value
 
 
 class SkySpatialModel(Model):
-    """Sky spatial model base class."""
+    """Sky spatial model base class.
+
+    The models are evaluated in the floating point precision of the ``lon``
+    and ``lat`` inputs, so float32 coordinates can be used to halve the
+    memory use for large maps.
+    """
 
     def __call__(self, lon, lat):
         """Call evaluate method"""
@@ -73,9 +283,7 @@ class SkyPointSource(SkySpatialModel):
 
     def __init__(self, lon_0, lat_0, frame="galactic"):
         self.frame = frame
-        self.lon_0 = Parameter(
-            "lon_0", Longitude(lon_0).wrap_at("180d"), min=-180, max=180
-        )
+        self.lon_0 = Parameter("lon_0", _wrap_lon(lon_0), min=-180, max=180)
         self.lat_0 = Parameter("lat_0", Latitude(lat_0), min=-90, max=90)
 
         super().__init__([self.lon_0, self.lat_0])
@@ -91,18 +299,22 @@ class SkyPointSource(SkySpatialModel):
     @staticmethod
     def evaluate(lon, lat, lon_0, lat_0):
         """Evaluate model."""
-        wrapval = lon_0 + 180 * u.deg
-        lon = Angle(lon).wrap_at(wrapval)
+        lon = _to_deg(lon)
+        lat = _to_deg(lat)
+        lon_0 = _to_deg(lon_0)
+        lat_0 = _to_deg(lat_0)
 
-        _, grad_lon = np.gradient(lon)
-        grad_lat, _ = np.gradient(lat)
-        lon_diff = np.abs((lon - lon_0) / grad_lon)
-        lat_diff = np.abs((lat - lat_0) / grad_lat)
+        # longitude difference, wrapped to [-180, 180) deg around lon_0
+        d_lon = (lon - lon_0 + 180) % 360 - 180
+        d_lat = lat - lat_0
 
-        lon_val = np.select([lon_diff < 1], [1 - lon_diff], 0) / np.abs(grad_lon)
-        lat_val = np.select([lat_diff < 1], [1 - lat_diff], 0) / np.abs(grad_lat)
+        # local pixel size, only the gradient along each coordinate's axis is needed
+        grad_lon = np.abs(np.gradient(d_lon, axis=1))
+        grad_lat = np.abs(np.gradient(d_lat, axis=0))
 
-        return lon_val * lat_val
+        value = _linear_kernel(d_lon, grad_lon)
+        value *= _linear_kernel(d_lat, grad_lat)
+        return u.Quantity(value, _DEG_2, copy=False)
 
 
 class SkyGaussian(SkySpatialModel):
@@ -145,9 +357,7 @@ class SkyGaussian(SkySpatialModel):
 
     def __init__(self, lon_0, lat_0, sigma, frame="galactic"):
         self.frame = frame
-        self.lon_0 = Parameter(
-            "lon_0", Longitude(lon_0).wrap_at("180d"), min=-180, max=180
-        )
+        self.lon_0 = Parameter("lon_0", _wrap_lon(lon_0), min=-180, max=180)
         self.lat_0 = Parameter("lat_0", Latitude(lat_0), min=-90, max=90)
         self.sigma = Parameter("sigma", Angle(sigma), min=0)
 
@@ -164,11 +374,14 @@ class SkyGaussian(SkySpatialModel):
     @staticmethod
     def evaluate(lon, lat, lon_0, lat_0, sigma):
         """Evaluate model."""
-        sep = angular_separation(lon, lat, lon_0, lat_0)
-        a = 1.0 - np.cos(sigma)
+        hav = _haversine_term(_coords_rad(lon, lat), _to_rad(lon_0), _to_rad(lat_0))
+        a = 1.0 - np.cos(_to_rad(sigma))
         norm = 1 / (4 * np.pi * a * (1.0 - np.exp(-1.0 / a)))
-        exponent = -0.5 * ((1 - np.cos(sep)) / a)
-        return u.Quantity(norm.value * np.exp(exponent).value, "sr-1", copy=False)
+        # -0.5 * (1 - cos(sep)) / a, with 1 - cos(sep) = 2 * hav
+        hav /= -a
+        np.exp(hav, out=hav)
+        hav *= norm
+        return u.Quantity(hav, _SR_1, copy=False)
 
 
 class SkyGaussianElongated(SkySpatialModel):
@@ -254,9 +467,7 @@ class SkyGaussianElongated(SkySpatialModel):
 
     def __init__(self, lon_0, lat_0, sigma_semi_major, e, phi, frame="galactic"):
         self.frame = frame
-        self.lon_0 = Parameter(
-            "lon_0", Longitude(lon_0).wrap_at("180d"), min=-180, max=180
-        )
+        self.lon_0 = Parameter("lon_0", _wrap_lon(lon_0), min=-180, max=180)
         self.lat_0 = Parameter("lat_0", Latitude(lat_0), min=-90, max=90)
         self.sigma_semi_major = Parameter("sigma_semi_major", Angle(sigma_semi_major))
         self.e = Parameter("e", e, min=0, max=1)
@@ -277,25 +488,38 @@ class SkyGaussianElongated(SkySpatialModel):
     @staticmethod
     def evaluate(lon, lat, lon_0, lat_0, sigma_semi_major, e, phi):
         """Evaluate model."""
-        sep = angular_separation(lon, lat, lon_0, lat_0)
-
-        phi_0 = position_angle(lon_0, lat_0, lon, lat)
-        d_phi = phi - phi_0
-        sigma_semi_minor = Angle(sigma_semi_major * np.sqrt(1 - e ** 2))
-
-        # Effective radius, used for model evaluation as in the symmetric case
-        a2 = (sigma_semi_major * np.sin(d_phi)) ** 2
-        b2 = (sigma_semi_minor * np.cos(d_phi)) ** 2
-        denominator = np.sqrt(a2 + b2)
-        sigma_eff = sigma_semi_major * sigma_semi_minor / denominator
-
+        coords = _coords_rad(lon, lat)
+        lon_0, lat_0 = _to_rad(lon_0), _to_rad(lat_0)
+        sigma_semi_major = _to_rad(sigma_semi_major)
+        e = u.Quantity(e, copy=False).to_value(u.dimensionless_unscaled)
+        sigma_semi_minor = sigma_semi_major * np.sqrt(1 - e ** 2)
         norm = 1 / (2 * np.pi * sigma_semi_major * sigma_semi_minor)
 
-        a = 1.0 - np.cos(sigma_eff)
-        exponent = -0.5 * ((1 - np.cos(sep)) / a)
-        return u.Quantity(
-            norm.to_value("sr-1") * np.exp(exponent).value, "sr-1", copy=False
-        )
+        hav = _haversine_term(coords, lon_0, lat_0)
+
+        # The rest is computed in place on a single buffer, to avoid one
+        # full size temporary array per operation.
+        value = np.asarray(_position_angle_rad(lon_0, lat_0, coords))
+        np.subtract(_to_rad(phi), value, out=value)
+        np.sin(value, out=value)
+        np.square(value, out=value)
+
+        # Effective radius, used for model evaluation as in the symmetric case:
+        # sigma_eff = sigma_M * sigma_m / sqrt(sigma_m^2 + (sigma_M^2 - sigma_m^2) * sin(d_phi)^2)
+        value *= sigma_semi_major ** 2 - sigma_semi_minor ** 2
+        value += sigma_semi_minor ** 2
+        np.sqrt(value, out=value)
+        np.divide(sigma_semi_major * sigma_semi_minor, value, out=value)
+
+        # exponent = -hav / (1 - cos(sigma_eff)), with 1 - cos(x) = 2 sin(x / 2)^2
+        value *= 0.5
+        np.sin(value, out=value)
+        np.square(value, out=value)
+        value *= -2
+        np.divide(hav, value, out=value)
+        np.exp(value, out=value)
+        value *= norm
+        return u.Quantity(value, _SR_1, copy=False)
 
 
 class SkyDisk(SkySpatialModel):
@@ -364,9 +588,7 @@ class SkyDisk(SkySpatialModel):
 
     def __init__(self, lon_0, lat_0, r_0, edge="0.01 deg", frame="galactic"):
         self.frame = frame
-        self.lon_0 = Parameter(
-            "lon_0", Longitude(lon_0).wrap_at("180d"), min=-180, max=180
-        )
+        self.lon_0 = Parameter("lon_0", _wrap_lon(lon_0), min=-180, max=180)
         self.lat_0 = Parameter("lat_0", Latitude(lat_0), min=-90, max=90)
         self.r_0 = Parameter("r_0", Angle(r_0))
         self.edge = Parameter("edge", Angle(edge), min=0.01, frozen=True)
@@ -384,13 +606,14 @@ class SkyDisk(SkySpatialModel):
     @staticmethod
     def evaluate(lon, lat, lon_0, lat_0, r_0, edge):
         """Evaluate model."""
-        sep = angular_separation(lon, lat, lon_0, lat_0)
+        sep = _haversine(_coords_rad(lon, lat), _to_rad(lon_0), _to_rad(lat_0))
+        r_0 = _to_rad(r_0)
 
         # Surface area of a spherical cap, see https://en.wikipedia.org/wiki/Spherical_cap
         norm = 1.0 / (2 * np.pi * (1 - np.cos(r_0)))
 
-        in_disk = smooth_edge(sep - r_0, edge)
-        return u.Quantity(norm.value * in_disk, "sr-1", copy=False)
+        in_disk = smooth_edge(sep - r_0, _to_rad(edge))
+        return u.Quantity(norm * in_disk, _SR_1, copy=False)
 
 
 class SkyEllipse(SkySpatialModel):
@@ -465,22 +688,13 @@ class SkyEllipse(SkySpatialModel):
         plt.show()
         """
 
-    __slots__ = ["frame", "lon_0", "lat_0", "semi_major", "e", "phi", "_offset_by"]
+    __slots__ = ["frame", "lon_0", "lat_0", "semi_major", "e", "phi"]
 
     def __init__(
         self, lon_0, lat_0, semi_major, e, phi, edge="0.01 deg", frame="galactic"
     ):
-        try:
-            from astropy.coordinates.angle_utilities import offset_by
-
-            self._offset_by = offset_by
-        except ImportError:
-            raise ImportError("The SkyEllipse model requires astropy>=3.1")
-
         self.frame = frame
-        self.lon_0 = Parameter(
-            "lon_0", Longitude(lon_0).wrap_at("180d"), min=-180, max=180
-        )
+        self.lon_0 = Parameter("lon_0", _wrap_lon(lon_0), min=-180, max=180)
         self.lat_0 = Parameter("lat_0", Latitude(lat_0), min=-90, max=90)
         self.semi_major = Parameter("semi_major", Angle(semi_major))
         self.e = Parameter("e", e, min=0, max=1)
@@ -501,38 +715,27 @@ class SkyEllipse(SkySpatialModel):
 
     @staticmethod
     def compute_norm(semi_major, e):
-        """Compute the normalization factor."""
-        semi_minor = semi_major * np.sqrt(1 - e ** 2)
-
-        def integral_fcn(x, a, b):
-            A = 1 / np.sin(a) ** 2
-            B = 1 / np.sin(b) ** 2
-            C = A - B
-            cs2 = np.cos(x) ** 2
+        """Compute the normalization factor.
 
-            return 1 - np.sqrt(1 - 1 / (B + C * cs2))
-
-        return (
-            2
-            * scipy.integrate.quad(
-                lambda x: integral_fcn(x, semi_major, semi_minor), 0, np.pi
-            )[0]
-        ) ** -1
+        The result is cached on the values of ``semi_major`` and ``e``.
+        """
+        e = u.Quantity(e, copy=False).to_value(u.dimensionless_unscaled)
+        return _ellipse_norm(float(_to_rad(semi_major)), float(e))
 
     def evaluate(self, lon, lat, lon_0, lat_0, semi_major, e, phi, edge):
         """Evaluate model."""
+        semi_major = _to_rad(semi_major)
+        e = u.Quantity(e, copy=False).to_value(u.dimensionless_unscaled)
+
         # find the foci of the ellipse
         c = semi_major * e
-        lon_1, lat_1 = self._offset_by(lon_0, lat_0, phi, c)
-        lon_2, lat_2 = self._offset_by(lon_0, lat_0, 180 * u.deg + phi, c)
-
-        sep_1 = angular_separation(lon, lat, lon_1, lat_1)
-        sep_2 = angular_separation(lon, lat, lon_2, lat_2)
+        foci = _ellipse_foci_rad(_to_rad(lon_0), _to_rad(lat_0), _to_rad(phi), c)
+        sep_sum = _focal_distance_sum(_coords_rad(lon, lat), foci)
 
-        in_ellipse = smooth_edge(sep_1 + sep_2 - 2 * semi_major, 2 * edge)
+        in_ellipse = smooth_edge(sep_sum - 2 * semi_major, 2 * _to_rad(edge))
 
         norm = SkyEllipse.compute_norm(semi_major, e)
-        return u.Quantity(norm * in_ellipse, "sr-1", copy=False)
+        return u.Quantity(norm * in_ellipse, _SR_1, copy=False)
 
 
 class SkyShell(SkySpatialModel):
@@ -571,9 +774,7 @@ class SkyShell(SkySpatialModel):
 
     def __init__(self, lon_0, lat_0, radius, width, frame="galactic"):
         self.frame = frame
-        self.lon_0 = Parameter(
-            "lon_0", Longitude(lon_0).wrap_at("180d"), min=-180, max=180
-        )
+        self.lon_0 = Parameter("lon_0", _wrap_lon(lon_0), min=-180, max=180)
         self.lat_0 = Parameter("lat_0", Latitude(lat_0), min=-90, max=90)
         self.radius = Parameter("radius", Angle(radius))
         self.width = Parameter("width", Angle(width))
@@ -591,20 +792,21 @@ class SkyShell(SkySpatialModel):
     @staticmethod
     def evaluate(lon, lat, lon_0, lat_0, radius, width):
         """Evaluate model."""
-        sep = angular_separation(lon, lat, lon_0, lat_0)
-        radius_out = radius + width
+        sep = _haversine(_coords_rad(lon, lat), _to_rad(lon_0), _to_rad(lat_0))
+        # the model is returned in deg-2, so compute it on degree floats
+        sep2 = np.asarray(np.rad2deg(sep) ** 2)
+        radius = _to_deg(radius)
+        radius_out = radius + _to_deg(width)
 
         norm = 3 / (2 * np.pi * (radius_out ** 3 - radius ** 3))
 
-        with np.errstate(invalid="ignore"):
-            # np.where and np.select do not work with quantities, so we use the
-            # workaround with indexing
-            value = np.sqrt(radius_out ** 2 - sep ** 2)
-            mask = [sep < radius]
-            value[mask] = (value - np.sqrt(radius ** 2 - sep ** 2))[mask]
-            value[sep > radius_out] = 0
-
-        return norm * value
+        # Clipping the radicand at zero sets the model to zero outside
+        # radius_out. The inner term only applies for sep < radius, so it is
+        # only computed on those pixels.
+        value = np.asarray(np.sqrt(np.maximum(radius_out ** 2 - sep2, 0)))
+        inner = sep2 < radius ** 2
+        value[inner] -= np.sqrt(radius ** 2 - sep2[inner])
+        return u.Quantity(norm * value, _DEG_2, copy=False)
 
 
 class SkyDiffuseConstant(SkySpatialModel):
@@ -690,8 +892,11 @@ class SkyDiffuseMap(SkySpatialModel):
 
     def normalize(self):
         """Normalize the diffuse map model so that it integrates to unity."""
-        data = self.map.data / self.map.data.sum()
-        data /= self.map.geom.solid_angle().to_value("sr")
+        solid_angle = self.map.geom.solid_angle().to_value("sr")
+        # single division of the data, keeping its floating point precision
+        dtype = np.result_type(self.map.data.dtype, np.float32)
+        scale = (self.map.data.sum() * solid_angle).astype(dtype, copy=False)
+        data = self.map.data / scale
         self.map = self.map.copy(data=data, unit="sr-1")
 
     @classmethod
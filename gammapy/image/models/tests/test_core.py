@@ -32,6 +32,33 @@ def test_sky_point_source():
     assert_allclose(model.position.b.deg, 2.5)
 
 
+@pytest.mark.parametrize(
+    "lon_0, expected", [("359.5 deg", -0.5), ("180 deg", -180), (-540 * u.deg, -180)]
+)
+def test_sky_model_lon_wrap(lon_0, expected):
+    model = SkyGaussian(lon_0=lon_0, lat_0="0 deg", sigma="1 deg")
+    assert model.lon_0.unit == "deg"
+    assert_allclose(model.lon_0.value, expected)
+
+
+def test_sky_model_lon_wrap_in_range():
+    for lon_0 in [0.1, 0.3, 12.345, -179.9, 179.9]:
+        model = SkyGaussian(lon_0=lon_0 * u.deg, lat_0="0 deg", sigma="1 deg")
+        assert model.lon_0.value == lon_0
+
+    model = SkyGaussian(lon_0="1 rad", lat_0="0 deg", sigma="1 deg")
+    assert model.lon_0.unit == "rad"
+    assert model.lon_0.value == 1
+
+    model = SkyGaussian(lon_0=4 * u.rad, lat_0="0 deg", sigma="1 deg")
+    assert model.lon_0.unit == "rad"
+    assert_allclose(model.lon_0.value, 4 - 2 * np.pi)
+
+    for lon_0 in [1, 1 * u.m]:
+        with pytest.raises(u.UnitTypeError):
+            SkyGaussian(lon_0=lon_0, lat_0="0 deg", sigma="1 deg")
+
+
 def test_sky_gaussian():
     sigma = 1 * u.deg
     model = SkyGaussian(lon_0="5 deg", lat_0="15 deg", sigma=sigma)
@@ -46,6 +73,22 @@ def test_sky_gaussian():
     assert_allclose(radius.value, 5 * sigma.value)
 
 
+def test_sky_gaussian_coord_reuse():
+    model = SkyGaussian(lon_0="1 deg", lat_0="1 deg", sigma="1 deg")
+    lon, lat = np.mgrid[0:3, 0:3] * u.deg
+    val = model(lon, lat)
+    assert_allclose(model(lon, lat), val)
+    assert_allclose(model(lon.copy(), lat.copy()), val)
+    assert_allclose(model(lat, lon), val.T)
+
+    # coordinate buffers modified in place are evaluated again
+    lon_new, lat_new = lon + 90 * u.deg, lat.copy()
+    expected = model(lon_new, lat_new)
+    lon[...] = lon_new
+    assert_allclose(model(lon, lat), expected)
+    assert_allclose(model(lon, lat).value, 0, atol=1e-15)
+
+
 def test_sky_gaussian_elongated():
     # test the normalization for an elongated Gaussian near the Galactic Plane
     m_geom_1 = WcsGeom.create(
@@ -223,6 +266,22 @@ def test_sky_shell():
     assert_allclose(radius.value, rad.value + width.value)
 
 
+@pytest.mark.parametrize(
+    "model",
+    [
+        SkyGaussian("1 deg", "1 deg", "1 deg"),
+        SkyGaussianElongated("1 deg", "1 deg", "1 deg", 0.7, "30 deg"),
+        SkyDisk("1 deg", "1 deg", "1 deg", edge="0.5 deg"),
+        SkyShell("1 deg", "1 deg", "0.5 deg", "0.5 deg"),
+    ],
+)
+def test_sky_model_float32(model):
+    lat, lon = np.mgrid[0:3:0.1, 0:3:0.1] * u.deg
+    val = model(lon.astype("float32"), lat.astype("float32"))
+    assert val.dtype == np.float32
+    assert_allclose(val, model(lon, lat), rtol=1e-4, atol=1e-3 * val.max())
+
+
 def test_sky_diffuse_constant():
     model = SkyDiffuseConstant(value="42 sr-1")
     lon = [1, 2] * u.deg
@@ -266,3 +325,25 @@ def test_sky_diffuse_map_normalize():
     assert vals.unit == ""
     integral = vals.sum()
     assert_allclose(integral.value, 1, rtol=1e-4)
+
+
+def test_sky_diffuse_map_update():
+    model_map = Map.create(map_type="wcs", width=(10, 5), binsz=0.5)
+    model_map.data += np.arange(model_map.data.size).reshape(model_map.data.shape)
+    model = SkyDiffuseMap(model_map)
+
+    coords = model_map.geom.get_coord()
+    lon, lat = coords.lon * u.deg, coords.lat * u.deg
+    val = model(lon, lat)
+
+    model.norm.value = 2
+    assert_allclose(model(lon, lat), 2 * val)
+
+    model.map = model.map.copy(data=2 * model.map.data)
+    assert_allclose(model(lon, lat), 4 * val)
+
+    model.map.data *= 3
+    assert_allclose(model(lon, lat), 12 * val)
+
+    model.map.data[...] = 0
+    assert_allclose(model(lon, lat).value, 0)
@@ -1,9 +1,11 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import pytest
+import numpy as np
 from numpy.testing import assert_allclose
 import astropy.units as u
-from astropy.convolution import Tophat2DKernel
+from astropy.convolution import Gaussian2DKernel, Tophat2DKernel
 from gammapy.image import ASmooth
+from gammapy.image.utils import scale_cube
 from gammapy.maps import Map
 from gammapy.utils.testing import requires_data
 
@@ -35,3 +37,20 @@ def test_asmooth(input_maps):
     for name in smoothed:
         actual = smoothed[name].data[100, 100]
         assert_allclose(actual, desired[name], rtol=1e-5)
+
+
+def test_scale_cube():
+    data = np.random.RandomState(0).uniform(0, 10, (40, 50)).astype("float32")
+    kernels = [Gaussian2DKernel(1), Gaussian2DKernel(2)]
+
+    cube = scale_cube(data, kernels)
+    assert cube.shape == (40, 50, 2)
+    assert cube.dtype == np.float32
+    assert cube.flags.c_contiguous
+
+    kernels.append(Tophat2DKernel(2))
+    cube = scale_cube(data, kernels)
+    assert cube.shape == (40, 50, 3)
+    assert cube.dtype == np.float64
+    assert cube.flags.c_contiguous
+    assert_allclose(cube, scale_cube(data, kernels, parallel=False))
@@ -1,19 +1,25 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 """Image utility functions"""
-import functools
 import logging
-import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import scipy.ndimage
-import scipy.signal
 from astropy.convolution import Gaussian2DKernel
 
+try:
+    from scipy.fftpack import next_fast_len
+except ImportError:
+    # scipy<0.18, pad to the next power of two instead
+    def next_fast_len(target):
+        return 1 << (int(target) - 1).bit_length()
+
+
 __all__ = ["scale_cube"]
 
 log = logging.getLogger(__name__)
 
 
-def _fftconvolve_wrap(kernel, data):
+def _fftconvolve_wrap(kernel, data, data_ft, fft_shape):
     # wrap gaussian filter as a special case, because the gain in
     # performance is factor ~100
     if isinstance(kernel, Gaussian2DKernel):
@@ -21,7 +27,32 @@ def _fftconvolve_wrap(kernel, data):
         norm = kernel.array.sum()
         return norm * scipy.ndimage.gaussian_filter(data, width)
     else:
-        return scipy.signal.fftconvolve(data, kernel.array, mode="same")
+        # same as scipy.signal.fftconvolve(mode="same"), but with the FFT of
+        # the data computed once for all kernels
+        kernel_ft = np.fft.rfftn(kernel.array, fft_shape)
+        result = np.fft.irfftn(data_ft * kernel_ft, fft_shape)
+        slices = tuple(
+            slice((n - 1) // 2, (n - 1) // 2 + size)
+            for n, size in zip(kernel.array.shape, data.shape)
+        )
+        return result[slices]
+
+
+def _data_fft(data, kernels):
+    """FFT of the data, zero padded for a linear convolution with all kernels."""
+    kernel_shapes = [
+        kernel.array.shape
+        for kernel in kernels
+        if not isinstance(kernel, Gaussian2DKernel)
+    ]
+    if not kernel_shapes:
+        return None, None
+
+    kernel_shape = np.max(kernel_shapes, axis=0)
+    fft_shape = [
+        next_fast_len(int(size + n - 1)) for size, n in zip(data.shape, kernel_shape)
+    ]
+    return np.fft.rfftn(data, fft_shape), fft_shape
 
 
 def scale_cube(data, kernels, parallel=True):
@@ -38,20 +69,32 @@ def scale_cube(data, kernels, parallel=True):
     kernels: list of `~astropy.convolution.Kernel`
         List of convolution kernels.
     parallel : bool
-        Whether to use multiprocessing.
+        Whether to convolve with the kernels in parallel threads. The
+        convolutions release the GIL, so the data is shared and not copied.
 
     Returns
     -------
     cube : `~numpy.ndarray`
-        Array of the shape (len(kernels), data.shape)
+        Array of the shape ``data.shape + (len(kernels),)``
     """
-    wrap = functools.partial(_fftconvolve_wrap, data=data)
+    # the FFT of the data is shared by all kernels
+    data_ft, fft_shape = _data_fft(data, kernels)
+
+    # images are written directly into the output, with the dtype that
+    # stacking the individual results gives: the Gaussian filter keeps
+    # floating point data types, the FFT convolution returns float64
+    gaussian = all(isinstance(kernel, Gaussian2DKernel) for kernel in kernels)
+    dtype = data.dtype if gaussian and data.dtype.kind == "f" else np.float64
+    cube = np.empty(data.shape + (len(kernels),), dtype=dtype)
+
+    def convolve(idx):
+        cube[..., idx] = _fftconvolve_wrap(kernels[idx], data, data_ft, fft_shape)
 
     if parallel:
-        pool = multiprocessing.Pool()
-        result = pool.map(wrap, kernels)
-        pool.close()
-        pool.join()
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(convolve, range(len(kernels))))
     else:
-        result = map(wrap, kernels)
-    return np.dstack(result)
+        for idx in range(len(kernels)):
+            convolve(idx)
+
+    return cube
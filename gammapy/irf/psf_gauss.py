@@ -1,12 +1,13 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import logging
+from collections import OrderedDict
 import numpy as np
 from astropy.convolution import Gaussian2DKernel
 from astropy.coordinates import Angle
 from astropy.io import fits
 from astropy.stats import gaussian_fwhm_to_sigma
 from astropy.table import Table
-from astropy.units import Quantity, Unit
+from astropy.units import Quantity
 from gammapy.utils.array import array_stats_str
 from gammapy.utils.energy import energy_logspace
 from gammapy.utils.gauss import MultiGauss2D
@@ -19,6 +20,9 @@ __all__ = ["EnergyDependentMultiGaussPSF"]
 
 log = logging.getLogger(__name__)
 
+# Maximum number of table PSFs kept per EnergyDependentMultiGaussPSF
+TABLE_PSF_CACHE_SIZE = 64
+
 
 class EnergyDependentMultiGaussPSF:
     """
@@ -88,6 +92,7 @@ class EnergyDependentMultiGaussPSF:
 
         self._interp_norms = self._setup_interpolators(self.norms)
         self._interp_sigmas = self._setup_interpolators(self.sigmas)
+        self._table_psf_cache = OrderedDict()
 
     def _setup_interpolators(self, values_list):
         interps = []
@@ -438,16 +443,37 @@ class EnergyDependentMultiGaussPSF:
         else:
             rad = Angle(rad).to("deg")
 
-        psf_value = Quantity(np.zeros((energies.size, rad.size)), "deg^-2")
+        psf_value = np.empty((energies.size, rad.size))
+        rad_deg = rad.deg
 
         for idx, energy in enumerate(energies):
             psf_gauss = self.psf_at_energy_and_theta(energy, theta)
-            psf_value[idx] = Quantity(psf_gauss(rad), "deg^-2")
+            psf_value[idx] = psf_gauss(rad_deg)
 
         return EnergyDependentTablePSF(
-            energy=energies, rad=rad, exposure=exposure, psf_value=psf_value
+            energy=energies,
+            rad=rad,
+            exposure=exposure,
+            psf_value=Quantity(psf_value, "deg^-2", copy=False),
         )
 
+    def _table_psf_at_offset(self, offset):
+        """Table PSF with default rad and exposure at a given offset (cached).
+
+        The cache keeps the ``TABLE_PSF_CACHE_SIZE`` most recently used offsets.
+        """
+        cache = self._table_psf_cache
+        key = round(float(offset.to_value("deg")), 6)
+
+        if key not in cache:
+            cache[key] = self.to_energy_dependent_table_psf(offset)
+
+        cache.move_to_end(key)
+        while len(cache) > TABLE_PSF_CACHE_SIZE:
+            cache.popitem(last=False)
+
+        return cache[key]
+
     def to_psf3d(self, rad):
         """Create a PSF3D from an analytical PSF.
 
@@ -467,14 +493,20 @@ class EnergyDependentMultiGaussPSF:
         energy_hi = self.energy_hi
         rad_lo = rad[:-1]
         rad_hi = rad[1:]
+        rad_center = 0.5 * (rad_lo + rad_hi)
 
-        psf_values = np.zeros(
-            (rad_lo.shape[0], offsets.shape[0], energy_lo.shape[0])
-        ) * Unit("sr-1")
+        # Fill a bare array and attach the unit once at the end,
+        # to avoid the Quantity overhead on every assignment. The array is
+        # allocated offset-major, so that each offset is a contiguous slab,
+        # and transposed to the (rad, offset, energy) PSF3D axis order.
+        psf_values = np.empty((offsets.shape[0], energy_lo.shape[0], rad_lo.shape[0]))
 
         for i, offset in enumerate(offsets):
-            psftable = self.to_energy_dependent_table_psf(offset)
-            psf_values[:, i, :] = psftable.evaluate(energy, 0.5 * (rad_lo + rad_hi)).T
+            psftable = self._table_psf_at_offset(offset)
+            values = psftable.evaluate(energy, rad_center)
+            psf_values[i] = values.to_value("sr-1")
+
+        psf_values = psf_values.transpose(2, 0, 1)
 
         return PSF3D(
             energy_lo,
@@ -482,7 +514,7 @@ class EnergyDependentMultiGaussPSF:
             offsets,
             rad_lo,
             rad_hi,
-            psf_values,
+            Quantity(psf_values, "sr-1", copy=False),
             self.energy_thresh_lo,
             self.energy_thresh_hi,
         )
@@ -5,6 +5,7 @@ from numpy.testing import assert_allclose, assert_almost_equal
 from astropy import units as u
 from astropy.io import fits
 from astropy.utils.data import get_pkg_data_filename
+from gammapy.irf import psf_gauss
 from gammapy.irf.psf_gauss import (
     EnergyDependentMultiGaussPSF,
     HESSMultiGaussPSF,
@@ -218,3 +219,15 @@ def test_multi_gauss_psf_kernel():
 
     assert_allclose(psf_kernel.array[25, 25], 0.05047558713797154)
     assert_allclose(psf_kernel.array[23, 29], 0.003259483464443567)
+
+
+def test_to_psf3d_table_psf_cache(monkeypatch):
+    monkeypatch.setattr(psf_gauss, "TABLE_PSF_CACHE_SIZE", 2)
+    psf = make_test_psf(energy_bins=3, theta_bins=4)
+    rads = np.linspace(0.0, 1.0, 11) * u.deg
+
+    psf_3d = psf.to_psf3d(rads)
+    assert len(psf._table_psf_cache) == 2
+
+    psf_3d_again = psf.to_psf3d(rads)
+    assert_allclose(psf_3d_again.psf_value, psf_3d.psf_value)
@@ -188,7 +188,9 @@ class Map(abc.ABC):
             return Map.from_hdulist(hdulist, hdu, hdu_bands, map_type)
 
     @staticmethod
-    def from_geom(geom, meta=None, data=None, map_type="auto", unit=""):
+    def from_geom(
+        geom, meta=None, data=None, map_type="auto", unit="", dtype="float32"
+    ):
         """Generate an empty map from a `MapGeom` instance.
 
         Parameters
@@ -206,6 +208,8 @@ class Map(abc.ABC):
             appropriate map type will be inferred from type of ``geom``.
         unit : str or `~astropy.units.Unit`
             Data unit.
+        dtype : str
+            Data type, used if no ``data`` is given.
 
         Returns
         -------
@@ -226,7 +230,7 @@ class Map(abc.ABC):
                 raise ValueError("Unrecognized geom type.")
 
         cls_out = Map._get_map_cls(map_type)
-        return cls_out(geom, data=data, meta=meta, unit=unit)
+        return cls_out(geom, data=data, meta=meta, unit=unit, dtype=dtype)
 
     @staticmethod
     def from_hdulist(hdulist, hdu=None, hdu_bands=None, map_type="auto"):
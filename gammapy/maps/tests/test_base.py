@@ -75,6 +75,9 @@ def test_map_from_geom():
     assert isinstance(m, HpxNDMap)
     assert m.geom.is_image
 
+    m = Map.from_geom(geom, dtype="float64")
+    assert m.data.dtype == np.float64
+
 
 @pytest.mark.parametrize(
     ("binsz", "width", "map_type", "skydir", "axes", "unit"), mapbase_args_with_axes
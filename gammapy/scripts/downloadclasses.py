@@ -16,6 +16,7 @@ BASE_URL_DEV = "https://raw.githubusercontent.com/gammapy/gammapy/master/"
 DEV_NBS_YAML_URL = BASE_URL_DEV + "tutorials/notebooks.yaml"
 DEV_SCRIPTS_YAML_URL = BASE_URL_DEV + "examples/scripts.yaml"
 DEV_DATA_JSON_URL = BASE_URL_DEV + "dev/datasets/gammapy-data-index.json"
+HASH_CHUNK_SIZE = 1024 * 1024
 
 
 def parse_datafiles(datasearch, datasetslist):
@@ -31,6 +32,15 @@ def parse_datafiles(datasearch, datasetslist):
                 yield label, data
 
 
+def get_file_md5(path):
+    """Compute the MD5 hex digest of a file, reading it in 1 MiB chunks."""
+    hash_md5 = hashlib.md5()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+            hash_md5.update(chunk)
+    return hash_md5.hexdigest()
+
+
 def parse_imagefiles(notebookslist):
     for item in notebookslist:
         record = notebookslist[item]
@@ -232,7 +242,7 @@ class ParallelDownload:
                 md5 = self.listfiles[rec]["hashmd5"]
             retrieve = True
             if md5 and path.exists():
-                md5local = hashlib.md5(path.read_bytes()).hexdigest()
+                md5local = get_file_md5(path)
                 if md5local == md5:
                     retrieve = False
             if retrieve:
@@ -14,6 +14,7 @@ from gammapy.spectrum import (
     SpectrumDatasetOnOffStacker,
 )
 from gammapy.spectrum.models import ConstantModel, ExponentialCutoffPowerLaw, PowerLaw
+from gammapy.stats import wstat
 from gammapy.utils.fitting import Fit
 from gammapy.utils.random import get_random_state
 from gammapy.utils.testing import mpl_plot_check, requires_data, requires_dependency
@@ -167,6 +168,22 @@ class TestSpectrumOnOff:
     def test_data_shape(self):
         assert self.dataset.data_shape == self.on_counts.data.shape
 
+    def test_likelihood_per_bin_update(self):
+        dataset = self.dataset.copy()
+        dataset.model = PowerLaw()
+        dataset.likelihood_per_bin()
+
+        # edits in place must be taken into account
+        dataset.counts.data[:] = 50
+        dataset.acceptance_off[:] = 2
+        desired = wstat(
+            n_on=dataset.counts.data,
+            n_off=dataset.counts_off.data,
+            alpha=dataset.alpha,
+            mu_sig=dataset.npred_sig().data,
+        )
+        assert_allclose(dataset.likelihood_per_bin(), desired)
+
     def test_npred_no_edisp(self):
         const = 1 / u.TeV / u.cm ** 2 / u.s
         model = ConstantModel(const)
@@ -3,13 +3,70 @@
 
 see :ref:`fit-statistics`
 """
+import math
+from collections import namedtuple
 import numpy as np
 
-__all__ = ["cash", "cstat", "wstat", "get_wstat_mu_bkg", "get_wstat_gof_terms"]
+__all__ = [
+    "cash",
+    "cstat",
+    "wstat",
+    "get_wstat_mu_bkg",
+    "get_wstat_gof_terms",
+    "get_wstat_cache",
+    "WStatCache",
+]
 
 N_ON_MIN = 1e-25
 
 
+def _as_float_array(value):
+    """Convert to a float64 array with at least one dimension."""
+    return np.atleast_1d(np.asanyarray(value, dtype=np.float64))
+
+
+def _zero_invalid(stat, condition):
+    """Set the non-finite values of ``stat`` to zero where ``condition`` holds.
+
+    Checking for non-finite values first skips the (slow) masked assignment
+    for the common case where no bin needs to be corrected.
+    """
+    invalid = ~np.isfinite(stat)
+    if invalid.any():
+        invalid &= condition
+        stat[invalid] = 0
+    return stat
+
+
+def _xlogy(x, y, out):
+    """Compute ``x * log(y)`` into ``out``, with zero where ``x == 0``."""
+    # y is shifted by one where x == 0, which avoids log(0) for empty bins
+    empty = x == 0
+    np.add(y, empty, out=out)
+    np.log(out, out=out)
+    out *= x
+    return _zero_invalid(out, empty)
+
+
+def _xlogx_scalar(x):
+    """Compute ``x * log(x)`` for a float, with zero for ``x == 0``."""
+    if x == 0:
+        return 0.0
+    elif x < 0:
+        return np.nan
+    else:
+        return x * math.log(x)
+
+
+def _cash(n_on, mu_on, out):
+    """Compute ``2 * (mu_on - n_on * log(mu_on))`` into ``out``."""
+    np.log(mu_on, out=out)
+    out *= n_on
+    np.subtract(mu_on, out, out=out)
+    out *= 2
+    return out
+
+
 def cash(n_on, mu_on):
     r"""Cash statistic, for Poisson data.
 
@@ -42,14 +99,18 @@ def cash(n_on, mu_on):
     * `Cash 1979, ApJ 228, 939
       <https://ui.adsabs.harvard.edu/abs/1979ApJ...228..939C>`_
     """
-    n_on = np.asanyarray(n_on)
-    mu_on = np.asanyarray(mu_on)
+    n_on = np.asanyarray(n_on, dtype=np.float64)
+    mu_on = np.asanyarray(mu_on, dtype=np.float64)
+    stat = np.empty(np.broadcast(n_on, mu_on).shape)
+
+    if np.all(mu_on > 0):
+        # no log(0) possible, so no need to suppress warnings
+        return _cash(n_on, mu_on, out=stat)
 
     # suppress zero division warnings, they are corrected below
     with np.errstate(divide="ignore", invalid="ignore"):
-        stat = 2 * (mu_on - n_on * np.log(mu_on))
-        stat = np.where(mu_on > 0, stat, 0)
-    return stat
+        _cash(n_on, mu_on, out=stat)
+    return _zero_invalid(stat, ~(mu_on > 0))
 
 
 def cstat(n_on, mu_on, n_on_min=N_ON_MIN):
@@ -94,16 +155,23 @@ def cstat(n_on, mu_on, n_on_min=N_ON_MIN):
     mu_on = np.asanyarray(mu_on, dtype=np.float64)
     n_on_min = np.asanyarray(n_on_min, dtype=np.float64)
 
-    n_on = np.where(n_on <= n_on_min, n_on_min, n_on)
+    n_on = np.maximum(n_on, n_on_min)
+    stat = np.empty(np.broadcast(n_on, mu_on).shape)
 
-    term1 = np.log(n_on) - np.log(mu_on)
-    stat = 2 * (mu_on - n_on + n_on * term1)
-    stat = np.where(mu_on > 0, stat, 0)
-
-    return stat
-
-
-def wstat(n_on, n_off, alpha, mu_sig, mu_bkg=None, extra_terms=True):
+    # suppress zero division warnings, they are corrected below
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(n_on, mu_on, out=stat)
+        np.log(stat, out=stat)
+        stat -= 1
+        stat *= n_on
+        stat += mu_on
+    stat *= 2
+    return _zero_invalid(stat, ~(mu_on > 0))
+
+
+def wstat(
+    n_on, n_off, alpha, mu_sig, mu_bkg=None, extra_terms=True, out=None, cache=None
+):
     r"""W statistic, for Poisson data with Poisson background.
 
     For a definition of WStat see :ref:`wstat`. If ``mu_bkg`` is not provided
@@ -124,6 +192,12 @@ def wstat(n_on, n_off, alpha, mu_sig, mu_bkg=None, extra_terms=True):
     extra_terms : bool, optional
         Add model independent terms to convert stat into goodness-of-fit
         parameter, default: True
+    out : `~numpy.ndarray`, optional
+        Array to store the result in, e.g. to reuse a buffer across the
+        iterations of a fit. Must have the broadcast shape of the inputs.
+    cache : `WStatCache`, optional
+        Model independent terms, see `get_wstat_cache`. If given, ``n_on``,
+        ``n_off`` and ``alpha`` are taken from the cache.
 
     Returns
     -------
@@ -143,60 +217,150 @@ def wstat(n_on, n_off, alpha, mu_sig, mu_bkg=None, extra_terms=True):
     # t_b * m_b = mu_bkg
     # t_s / t_b = alpha
 
-    n_on = np.atleast_1d(np.asanyarray(n_on, dtype=np.float64))
-    n_off = np.atleast_1d(np.asanyarray(n_off, dtype=np.float64))
-    alpha = np.atleast_1d(np.asanyarray(alpha, dtype=np.float64))
-    mu_sig = np.atleast_1d(np.asanyarray(mu_sig, dtype=np.float64))
+    if cache is None:
+        cache = get_wstat_cache(n_on, n_off, alpha, gof_terms=extra_terms)
+
+    mu_sig = _as_float_array(mu_sig)
+    if mu_bkg is not None:
+        mu_bkg = _as_float_array(mu_bkg)
+
+    return _wstat(mu_sig, cache, mu_bkg, extra_terms, out)
 
+
+def _wstat(mu_sig, cache, mu_bkg=None, extra_terms=True, out=None):
+    """W statistic for float arrays ``mu_sig`` and ``mu_bkg``, see `wstat`.
+
+    Does not convert its inputs, so it can be called directly from a fit loop.
+    """
     if mu_bkg is None:
-        mu_bkg = get_wstat_mu_bkg(n_on, n_off, alpha, mu_sig)
+        mu_bkg = _wstat_mu_bkg(mu_sig, cache)
 
-    term1 = mu_sig + (1 + alpha) * mu_bkg
+    n_on, n_off, alpha = cache.n_on, cache.n_off, cache.alpha
+    shape = np.broadcast(n_on, n_off, alpha, mu_sig, mu_bkg).shape
+    if out is None:
+        out = np.empty(shape)
+    term = np.empty(shape)
 
-    # suppress zero division warnings, they are corrected below
-    with np.errstate(divide="ignore", invalid="ignore"):
-        # This is a false positive error from pylint
-        # See https://github.com/PyCQA/pylint/issues/2436
-        term2_ = -n_on * np.log(
-            mu_sig + alpha * mu_bkg
-        )  # pylint:disable=invalid-unary-operand-type
-    # Handle n_on == 0
-    condition = n_on == 0
-    term2 = np.where(condition, 0, term2_)
+    # first term: mu_sig + (1 + alpha) * mu_bkg
+    np.multiply(cache.one_plus_alpha, mu_bkg, out=out)
+    out += mu_sig
 
     # suppress zero division warnings, they are corrected below
     with np.errstate(divide="ignore", invalid="ignore"):
-        # This is a false positive error from pylint
-        # See https://github.com/PyCQA/pylint/issues/2436
-        term3_ = -n_off * np.log(mu_bkg)  # pylint:disable=invalid-unary-operand-type
-    # Handle n_off == 0
-    condition = n_off == 0
-    term3 = np.where(condition, 0, term3_)
+        # second term: -n_on * log(mu_sig + alpha * mu_bkg)
+        np.multiply(alpha, mu_bkg, out=term)
+        term += mu_sig
+        out -= _xlogy(n_on, term, out=term)
+
+        # third term: -n_off * log(mu_bkg)
+        out -= _xlogy(n_off, mu_bkg, out=term)
 
-    stat = 2 * (term1 + term2 + term3)
+    out *= 2
 
     if extra_terms:
-        stat += get_wstat_gof_terms(n_on, n_off)
+        if cache.gof_terms is None:
+            out += get_wstat_gof_terms(n_on, n_off)
+        else:
+            out += cache.gof_terms
 
-    return stat
+    return out
 
 
-def get_wstat_mu_bkg(n_on, n_off, alpha, mu_sig):
+def get_wstat_mu_bkg(n_on, n_off, alpha, mu_sig, cache=None):
     """Background estimate ``mu_bkg`` for WSTAT.
 
     See :ref:`wstat`.
+
+    Parameters
+    ----------
+    n_on : array_like
+        Total observed counts
+    n_off : array_like
+        Total observed background counts
+    alpha : array_like
+        Exposure ratio between on and off region
+    mu_sig : array_like
+        Signal expected counts
+    cache : `WStatCache`, optional
+        Model independent terms, see `get_wstat_cache`. If given, ``n_on``,
+        ``n_off`` and ``alpha`` are taken from the cache.
+
+    Returns
+    -------
+    mu_bkg : ndarray
+        Background expected counts
     """
-    n_on = np.atleast_1d(np.asanyarray(n_on, dtype=np.float64))
-    n_off = np.atleast_1d(np.asanyarray(n_off, dtype=np.float64))
-    alpha = np.atleast_1d(np.asanyarray(alpha, dtype=np.float64))
-    mu_sig = np.atleast_1d(np.asanyarray(mu_sig, dtype=np.float64))
+    if cache is None:
+        cache = get_wstat_cache(n_on, n_off, alpha, gof_terms=False)
+
+    return _wstat_mu_bkg(_as_float_array(mu_sig), cache)
+
 
+def _wstat_mu_bkg(mu_sig, cache):
+    """Background estimate for a float array ``mu_sig``, see `get_wstat_mu_bkg`."""
     # NOTE: Corner cases in the docs are all handled correcty by this formula
-    C = alpha * (n_on + n_off) - (1 + alpha) * mu_sig
-    D = np.sqrt(C ** 2 + 4 * alpha * (alpha + 1) * n_off * mu_sig)
-    mu_bkg = (C + D) / (2 * alpha * (alpha + 1))
+    C = cache.alpha_n_on_off - cache.one_plus_alpha * mu_sig
+    D = np.square(C)
+    D += cache.four_alpha_alpha1_n_off * mu_sig
+    np.sqrt(D, out=D)
+    D += C
+    D /= cache.two_alpha_alpha1
+    return D
+
+
+WStatCache = namedtuple(
+    "WStatCache",
+    [
+        "n_on",
+        "n_off",
+        "alpha",
+        "alpha_n_on_off",
+        "one_plus_alpha",
+        "four_alpha_alpha1_n_off",
+        "two_alpha_alpha1",
+        "gof_terms",
+    ],
+)
+WStatCache.__doc__ = """Model independent terms of WSTAT, see `get_wstat_cache`."""
+
+
+def get_wstat_cache(n_on, n_off, alpha, gof_terms=True):
+    """Precompute the model independent terms of WSTAT.
+
+    In a fit ``n_on``, ``n_off`` and ``alpha`` stay the same, so these
+    terms can be computed once and passed to `wstat` and `get_wstat_mu_bkg`.
 
-    return mu_bkg
+    Parameters
+    ----------
+    n_on : array_like
+        Total observed counts
+    n_off : array_like
+        Total observed background counts
+    alpha : array_like
+        Exposure ratio between on and off region
+    gof_terms : bool, optional
+        Also compute the goodness of fit terms, see `get_wstat_gof_terms`.
+
+    Returns
+    -------
+    cache : `WStatCache`
+        Model independent terms.
+    """
+    n_on = _as_float_array(n_on)
+    n_off = _as_float_array(n_off)
+    alpha = _as_float_array(alpha)
+
+    alpha_alpha1 = alpha * (alpha + 1)
+    return WStatCache(
+        n_on=n_on,
+        n_off=n_off,
+        alpha=alpha,
+        alpha_n_on_off=alpha * (n_on + n_off),
+        one_plus_alpha=1 + alpha,
+        four_alpha_alpha1_n_off=4 * alpha_alpha1 * n_off,
+        two_alpha_alpha1=2 * alpha_alpha1,
+        gof_terms=get_wstat_gof_terms(n_on, n_off) if gof_terms else None,
+    )
 
 
 def get_wstat_gof_terms(n_on, n_off):
@@ -204,14 +368,24 @@ def get_wstat_gof_terms(n_on, n_off):
 
     See :ref:`wstat`.
     """
-    term = np.zeros(len(n_on))
+    if np.ndim(n_on) == 0 and np.ndim(n_off) == 0:
+        n_on, n_off = float(n_on), float(n_off)
+        return 2 * (_xlogx_scalar(n_on) - n_on + _xlogx_scalar(n_off) - n_off)
 
-    # suppress zero division warnings, they are corrected below
-    with np.errstate(divide="ignore", invalid="ignore"):
-        term1 = -n_on * (1 - np.log(n_on))
-        term2 = -n_off * (1 - np.log(n_off))
+    n_on = _as_float_array(n_on)
+    n_off = _as_float_array(n_off)
 
-    term += np.where(n_on == 0, 0, term1)
-    term += np.where(n_off == 0, 0, term2)
+    shape = np.broadcast(n_on, n_off).shape
+    term = np.empty(shape)
+    term_off = np.empty(shape)
 
-    return 2 * term
+    # suppress zero division warnings, they are corrected below
+    with np.errstate(divide="ignore", invalid="ignore"):
+        _xlogy(n_on, n_on, out=term)
+        _xlogy(n_off, n_off, out=term_off)
+
+    term -= n_on
+    term += term_off
+    term -= n_off
+    term *= 2
+    return term
@@ -5,12 +5,13 @@ cimport numpy as np
 cimport cython
 
 cdef extern from "math.h":
-    float log(float x)
+    float log(float x) nogil
 
 @cython.cdivision(True)
 @cython.boundscheck(False)
 def cash_sum_cython(np.ndarray[np.float_t, ndim=1] counts,
-                    np.ndarray[np.float_t, ndim=1] npred):
+                    np.ndarray[np.float_t, ndim=1] npred,
+                    np.ndarray[np.uint8_t, ndim=1, cast=True] mask=None):
     """Summed cash fit statistics.
 
     Parameters
@@ -19,22 +20,30 @@ def cash_sum_cython(np.ndarray[np.float_t, ndim=1] counts,
         Counts array.
     npred : `~numpy.ndarray`
         Predicted counts array.
+    mask : `~numpy.ndarray`, optional
+        Boolean mask, only bins where it is true are summed.
     """
     cdef np.float_t sum = 0
     cdef unsigned int i, ni
+    cdef bint use_mask = mask is not None
     ni = counts.shape[0]
-    for i in range(ni):
-        if npred[i] > 0:
-            sum += npred[i]
-            if counts[i] > 0:
-                sum -= counts[i] * log(npred[i])
+    # no Python objects are used in the loop, so other threads can run
+    with nogil:
+        for i in range(ni):
+            if use_mask and not mask[i]:
+                continue
+            if npred[i] > 0:
+                sum += npred[i]
+                if counts[i] > 0:
+                    sum -= counts[i] * log(npred[i])
     return 2 * sum
 
 
 @cython.cdivision(True)
 @cython.boundscheck(False)
 def cstat_sum_cython(np.ndarray[np.float_t, ndim=1] counts,
-                     np.ndarray[np.float_t, ndim=1] npred):
+                     np.ndarray[np.float_t, ndim=1] npred,
+                     np.ndarray[np.uint8_t, ndim=1, cast=True] mask=None):
     """Summed cstat fit statistics.
 
     Parameters
@@ -43,13 +52,19 @@ def cstat_sum_cython(np.ndarray[np.float_t, ndim=1] counts,
         Counts array.
     npred : `~numpy.ndarray`
         Predicted counts array.
+    mask : `~numpy.ndarray`, optional
+        Boolean mask, only bins where it is true are summed.
     """
     cdef np.float_t sum = 0
     cdef unsigned int i, ni
+    cdef bint use_mask = mask is not None
     ni = counts.shape[0]
-    for i in range(ni):
-        if npred[i] > 0:
-            sum += npred[i]
-            if counts[i] > 0:
-                sum += (- counts[i] + counts[i] * log(counts[i] / npred[i]))
+    with nogil:
+        for i in range(ni):
+            if use_mask and not mask[i]:
+                continue
+            if npred[i] > 0:
+                sum += npred[i]
+                if counts[i] > 0:
+                    sum += (- counts[i] + counts[i] * log(counts[i] / npred[i]))
     return 2 * sum
\ No newline at end of file
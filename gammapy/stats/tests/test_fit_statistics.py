@@ -118,6 +118,19 @@ def test_cash_sum_cython(test_data):
     assert_allclose(stat, ref)
 
 
+def test_cash_sum_cython_mask(test_data):
+    counts = np.array(test_data["n_on"], dtype=float)
+    npred = np.array(test_data["mu_sig"], dtype=float)
+    mask = np.array(test_data["n_off"]) > 4
+    stat = stats.cash_sum_cython(counts=counts, npred=npred, mask=mask)
+    ref = stats.cash(counts[mask], npred[mask]).sum()
+    assert_allclose(stat, ref)
+
+    stat = stats.cstat_sum_cython(counts=counts, npred=npred, mask=mask)
+    ref = stats.cstat(counts[mask], npred[mask]).sum()
+    assert_allclose(stat, ref)
+
+
 def test_ctstat_sum_cython(test_data):
     counts = np.array(test_data["n_on"], dtype=float)
     npred = np.array(test_data["mu_sig"], dtype=float)
@@ -28,8 +28,7 @@ def normal_prior(value, mean, sigma):
 
 def par_to_model(dataset, pars):
     """Update model in dataset with a list of free parameters factors"""
-    for i, p in enumerate(dataset.parameters.free_parameters):
-        p.factor = pars[i]
+    dataset.parameters.set_parameter_factors(pars)
 
 
 def ln_uniform_prior(dataset):
@@ -38,20 +37,54 @@ def ln_uniform_prior(dataset):
     Return probability of parameter values according to prior knowledge.
     Parameter limits should be done here through uniform prior ditributions
     """
-    logprob = 0
-    for par in dataset.parameters.free_parameters:
-        logprob += uniform_prior(par.value, par.min, par.max)
+    context = _LnProbContext(dataset)
+    values = np.array([par.value for par in context.parameters])
+    return context.ln_uniform_prior(values)
 
-    return logprob
 
+class _LnProbContext:
+    """Free parameters of a dataset and their prior limits, for `lnprob`.
 
-def lnprob(pars, dataset):
-    """Estimate the likelihood of a model including prior on parameters."""
-    # Update model parameters factors inplace
-    for factor, par in zip(pars, dataset.parameters.free_parameters):
-        par.factor = factor
+    Built once per MCMC run, so that the parameter list is not collected
+    again for every walker step.
+    """
+
+    def __init__(self, dataset):
+        self.parameters = dataset.parameters.free_parameters
+        self.scales = np.array([par.scale for par in self.parameters])
+        self.vmin = np.array([par.min for par in self.parameters])
+        self.vmax = np.array([par.max for par in self.parameters])
 
-    lnprob_priors = ln_uniform_prior(dataset)
+    def set_factors(self, factors):
+        """Set the factors of the free parameters."""
+        for par, factor in zip(self.parameters, factors):
+            par.factor = factor
+
+    def ln_uniform_prior(self, values):
+        """Vectorised `uniform_prior`, summed over all free parameters."""
+        if np.all((self.vmin <= values) & (values <= self.vmax)):
+            return 0.0
+        else:
+            return -np.inf
+
+
+def lnprob(pars, dataset, context=None):
+    """Estimate the likelihood of a model including prior on parameters.
+
+    ``context`` holds the free parameters of ``dataset`` and their prior
+    limits; it is created if not given.
+    """
+    if context is None:
+        context = _LnProbContext(dataset)
+
+    lnprob_priors = context.ln_uniform_prior(pars * context.scales)
+
+    # no need to update and evaluate the model outside of the prior range
+    if lnprob_priors == -np.inf:
+        return lnprob_priors
+
+    # Update model parameters factors inplace
+    context.set_factors(pars)
 
     # dataset.likelihood returns Cash statistics values
     # emcee will maximisise the LogLikelihood so we need -dataset.likelihood
@@ -60,7 +93,7 @@ def lnprob(pars, dataset):
     return total_lnprob
 
 
-def run_mcmc(dataset, nwalkers=8, nrun=1000, threads=1):
+def run_mcmc(dataset, nwalkers=8, nrun=1000, threads=1, random_state="random-seed"):
     """Run the MCMC sampler.
 
     Parameters
@@ -71,18 +104,24 @@ def run_mcmc(dataset, nwalkers=8, nrun=1000, threads=1):
         Number of walkers
     nrun : int
         Number of steps each walker takes
-    threads : (optional)
-        Number of threads or processes to use
+    threads : int, optional
+        Number of processes used to evaluate the walkers in parallel
+    random_state : {int, 'random-seed', 'global-rng', `~numpy.random.RandomState`}
+        Defines random number generator initialisation for the initial
+        walker positions and the sampler moves.
+        Passed to `~gammapy.utils.random.get_random_state`.
 
     Returns
     -------
     sampler : `emcee.EnsembleSampler`
         sampler object containing the trace of all walkers.
     """
+    import multiprocessing
     import emcee
+    from gammapy.utils.random import get_random_state
 
     dataset.parameters.autoscale()  # Autoscale parameters
-    pars = [par.factor for par in dataset.parameters.free_parameters]
+    pars = np.array([par.factor for par in dataset.parameters.free_parameters])
     ndim = len(pars)
 
     # Initialize walkers in a ball of relative size 0.5% in all dimensions if the
@@ -90,8 +129,8 @@ def run_mcmc(dataset, nwalkers=8, nrun=1000, threads=1):
     # TODO: the spread of 0.5% below is valid if a pre-fit of the model has been obtained.
     # currently the run_mcmc() doesn't know the status of previous fit.
     spread = 0.5 / 100
-    p0var = np.array([spread * pp for pp in pars])
-    p0 = emcee.utils.sample_ball(pars, p0var, nwalkers)
+    random_state = get_random_state(random_state)
+    p0 = pars + spread * pars * random_state.normal(size=(nwalkers, ndim))
 
     labels = []
     for par in dataset.parameters.free_parameters:
@@ -104,14 +143,28 @@ def run_mcmc(dataset, nwalkers=8, nrun=1000, threads=1):
 
     log.info("Free parameters: {}".format(labels))
 
+    context = _LnProbContext(dataset)
+
+    # ``threads`` is ignored by emcee>=3, so processes are handled with a pool
+    pool = multiprocessing.Pool(processes=threads) if threads > 1 else None
     sampler = emcee.EnsembleSampler(
-        nwalkers, ndim, lnprob, args=[dataset], threads=threads
+        nwalkers, ndim, lnprob, args=[dataset, context], pool=pool
     )
+    # emcee seeds its moves from the global numpy state otherwise
+    sampler.random_state = random_state.get_state()
 
     log.info("Starting MCMC sampling: nwalkers={}, nrun={}".format(nwalkers, nrun))
-    for idx, result in enumerate(sampler.sample(p0, iterations=nrun)):
-        if idx % (nrun / 4) == 0:
-            log.info("{0:5.0%}".format(idx / nrun))
+    log_every = max(1, nrun // 4)
+    try:
+        for idx, result in enumerate(sampler.sample(p0, iterations=nrun)):
+            if idx % log_every == 0:
+                log.info("{0:5.0%}".format(idx / nrun))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+            sampler.pool = None
+
     log.info("100% => sampling completed")
 
     return sampler
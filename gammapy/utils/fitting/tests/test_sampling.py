@@ -0,0 +1,64 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import numpy as np
+from numpy.testing import assert_allclose
+from gammapy.utils.fitting import Parameter, Parameters
+from gammapy.utils.fitting.sampling import _LnProbContext, lnprob, run_mcmc
+from gammapy.utils.testing import requires_dependency
+
+
+class MyDataset:
+    def __init__(self):
+        self.parameters = Parameters(
+            [Parameter("x", 2, min=0, max=4), Parameter("y", 3e2, min=0, max=6e2)]
+        )
+        self.parameters.autoscale("factor1")
+        self.n_calls = 0
+
+    def likelihood(self):
+        self.n_calls += 1
+        x, y = [p.value for p in self.parameters]
+        return (x - 2) ** 2 + ((y - 3e2) / 1e2) ** 2
+
+
+def test_lnprob_context():
+    dataset = MyDataset()
+    context = _LnProbContext(dataset)
+
+    for pars in [[1, 1], [1.5, 0.5], [0.1, 1.9]]:
+        pars = np.array(pars)
+        expected = lnprob(pars, dataset)
+        assert_allclose(lnprob(pars, dataset, context), expected)
+        assert_allclose(dataset.parameters["x"].value, 2 * pars[0])
+        assert_allclose(dataset.parameters["y"].value, 3e2 * pars[1])
+
+    assert_allclose(lnprob(np.array([1, 1]), dataset, context), 0)
+    assert_allclose(lnprob(np.array([1.5, 1]), dataset, context), -1)
+
+
+def test_lnprob_outside_prior():
+    dataset = MyDataset()
+    context = _LnProbContext(dataset)
+
+    for pars in [[2.5, 1], [1, -0.1]]:
+        assert lnprob(np.array(pars), dataset, context) == -np.inf
+
+    assert dataset.n_calls == 0
+    # the parameters are left unchanged
+    assert_allclose(dataset.parameters["x"].value, 2)
+    assert_allclose(dataset.parameters["y"].value, 3e2)
+
+
+@requires_dependency("emcee")
+def test_run_mcmc_random_state():
+    chains = []
+    for threads, global_seed in [(1, 1), (2, 2), (2, 3)]:
+        # the result must not depend on the global random number generator
+        np.random.seed(global_seed)
+        sampler = run_mcmc(
+            MyDataset(), nwalkers=6, nrun=20, threads=threads, random_state=0
+        )
+        chains.append(sampler.chain)
+
+    assert chains[0].shape == (6, 20, 2)
+    assert_allclose(chains[1], chains[0])
+    assert_allclose(chains[2], chains[0])
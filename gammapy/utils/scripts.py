@@ -6,6 +6,11 @@ import os.path
 from pathlib import Path
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 __all__ = ["read_yaml", "write_yaml", "make_path", "recursive_merge_dicts"]
 
 
@@ -62,7 +67,7 @@ def read_yaml(filename, logger=None):
         logger.info("Reading {}".format(path))
 
     text = path.read_text()
-    return yaml.safe_load(text)
+    return yaml.load(text, Loader=SafeLoader)
 
 
 def write_yaml(dictionary, filename, logger=None):